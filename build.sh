@@ -1 +1,3 @@
-python3 src/main.py "/site-generator/"
+# Set PYTHON to build with another interpreter, e.g. PYTHON=pypy3 ./build.sh, or
+# PYTHON_JIT=1 PYTHON=python3.13 ./build.sh on a CPython built with --enable-experimental-jit.
+${PYTHON:-python3} src/main.py "/site-generator/"
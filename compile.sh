@@ -0,0 +1,26 @@
+# Optional: compile the renderer to C extensions (pip install cython, or mypy for mypyc).
+# Python imports the built src/*.so ahead of the .py; delete it to go back to pure Python.
+#   ./compile.sh          Cython, pure-Python mode (htmlnode only; textnode gains nothing)
+#   ./compile.sh mypyc    mypyc, htmlnode and textnode
+#   ./compile.sh pgo      mypyc, rebuilt with a gcc profile from the tests and a site build
+set -e
+case "${1:-cython}" in
+  cython)
+    cythonize -i -3 -X annotation_typing=False src/htmlnode.py
+    ;;
+  mypyc)
+    (cd src && mypyc htmlnode.py textnode.py)
+    ;;
+  pgo)
+    (cd src && CFLAGS="-fprofile-generate" LDFLAGS="-fprofile-generate" mypyc htmlnode.py textnode.py)
+    ${PYTHON:-python3} -m unittest discover -s src
+    ${PYTHON:-python3} src/main.py "/site-generator/" --parallel 1 --clean-cache
+    # Drop the instrumented objects (keeping the .gcda profile) so they are rebuilt.
+    rm -f src/build/temp.*/build/*.o src/build/lib.*/*.so src/*.so
+    (cd src && CFLAGS="-fprofile-use -fprofile-correction" mypyc htmlnode.py textnode.py)
+    ;;
+  *)
+    echo "usage: $0 [cython|mypyc|pgo]" >&2
+    exit 2
+    ;;
+esac
@@ -1,2 +1,2 @@
-python3 src/main.py
+${PYTHON:-python3} src/main.py
 cd docs && python3 -m http.server 8888
\ No newline at end of file
@@ -1,23 +1,42 @@
+from collections.abc import Sequence
+
+
 class HTMLNode:
+    # Nodes are treated as immutable once built: the attribute string is
+    # computed in __init__ and rendered output is memoized on first use.
+    # props is copied so a caller reusing its dict cannot desynchronize the
+    # cached string; call _invalidate_props() after changing node.props.
+    __slots__ = ("tag", "value", "children", "props", "_html", "_props_html")
+
     def __init__(
         self,
         tag: str | None = None,
         value: str | None = None,
-        children: list["HTMLNode"] | None = None,
+        children: Sequence["HTMLNode"] | None = None,
         props: dict[str, str] | None = None,
     ):
         self.tag = tag
         self.value = value
         self.children = children
-        self.props = props
+        self.props = dict(props) if props else props
+        self._html: str | None = None
+        self._props_html = self._format_props()
 
     def to_html(self) -> str:
         raise NotImplementedError
 
     def props_to_html(self) -> str:
+        return self._props_html
+
+    def _format_props(self) -> str:
         if not self.props:
             return ""
-        return " " + " ".join(f'{k}="{v}"' for k, v in self.props.items())
+        return " " + " ".join([f'{k}="{v}"' for k, v in self.props.items()])
+
+    def _invalidate_props(self) -> None:
+        """Refresh the cached attribute string (and rendered HTML) after mutating props."""
+        self._props_html = self._format_props()
+        self._html = None
 
     def __repr__(self) -> str:
         return f"HTMLNode(tag={self.tag!r}, value={self.value!r}, children={self.children!r}, props={self.props!r})"
@@ -29,40 +48,94 @@ VOID_HTML_TAGS = frozenset(
 
 
 class LeafNode(HTMLNode):
+    # A leaf's output is fully known once it is built, so it is rendered in
+    # __init__ and to_html() just returns it; a missing value still raises
+    # on render rather than on construction.
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str | None,
-        value: str,
+        value: str | None,
         props: dict[str, str] | None = None,
     ):
         super().__init__(tag=tag, value=value, children=None, props=props)
+        self._html = self._render()
 
-    def to_html(self) -> str:
+    def _render(self) -> str | None:
         if self.value is None:
-            raise ValueError("LeafNode must have a value")
+            return None
         if self.tag is None:
             return self.value
         if self.tag in VOID_HTML_TAGS:
-            return f"<{self.tag}{self.props_to_html()}>"
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            return f"<{self.tag}{self._props_html}>"
+        return f"<{self.tag}{self._props_html}>{self.value}</{self.tag}>"
+
+    def _invalidate_props(self) -> None:
+        super()._invalidate_props()
+        self._html = self._render()
+
+    def to_html(self) -> str:
+        if self._html is None:
+            raise ValueError("LeafNode must have a value")
+        return self._html
 
     def __repr__(self) -> str:
         return f"LeafNode(tag={self.tag!r}, value={self.value!r}, props={self.props!r})"
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(
         self,
-        tag: str,
-        children: list["HTMLNode"],
+        tag: str | None,
+        children: Sequence["HTMLNode"] | None,
         props: dict[str, str] | None = None,
     ):
+        # Children are frozen into a tuple, which is smaller than a list.
+        if children is not None:
+            children = tuple(children)
         super().__init__(tag=tag, value=None, children=children, props=props)
 
     def to_html(self) -> str:
+        if self._html is None:
+            parts: list[str] = []
+            self._emit(parts)
+            self._html = "".join(parts)
+        return self._html
+
+    def _open_tag(self) -> str:
         if self.tag is None:
             raise ValueError("ParentNode must have a tag")
         if self.children is None:
             raise ValueError("ParentNode must have children")
-        inner = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{inner}</{self.tag}>"
+        return f"<{self.tag}{self._props_html}>"
+
+    def _emit(self, parts: list[str]) -> None:
+        if self._html is not None:
+            parts.append(self._html)
+            return
+        # Walk the tree with an explicit stack of (children iterator, close
+        # tag) so nesting depth is not bounded by the recursion limit.
+        append = parts.append
+        append(self._open_tag())
+        stack = [(iter(self.children or ()), f"</{self.tag}>")]
+        while stack:
+            children, close = stack[-1]
+            for child in children:
+                # Only the built-in node types are read through their memo or
+                # walked in place; a subclass may override to_html().
+                html = child._html
+                cls = type(child)
+                if html is not None and (cls is LeafNode or cls is ParentNode):
+                    append(html)
+                elif cls is ParentNode and isinstance(child, ParentNode):  # narrows for mypyc
+                    append(child._open_tag())
+                    stack.append((iter(child.children or ()), f"</{child.tag}>"))
+                    break
+                else:
+                    append(child.to_html())
+            else:
+                stack.pop()
+                append(close)
@@ -1,46 +1,261 @@
+import argparse
+import hashlib
 import os
+import re
 import shutil
-import sys
+import tempfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
-from textnode import TextNode, TextType, markdown_to_html_node, extract_title
+import htmlnode
+import textnode
+from textnode import TextNode, TextType, markdown_to_html, extract_title
+
+CACHE_DIR = ".site-cache"
+
+_PLACEHOLDER_RE = re.compile(r"(\{\{ Title \}\}|\{\{ Content \}\})")
+_TITLE = b"{{ Title }}"
+
+
+def _renderer_digest() -> bytes:
+    """Hash of the modules that render pages, so cache entries from older code are never reused."""
+    digest = hashlib.sha256()
+    for path in (htmlnode.__file__, textnode.__file__, __file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+_RENDERER_DIGEST = _renderer_digest()
+
+
+def _read_text(path: str) -> str:
+    """Read a UTF-8 file in one read, normalizing newlines like text-mode open()."""
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write data to path with as few write syscalls as the OS allows (usually one)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _cache_key(markdown: str, template: tuple[bytes, ...], basepath: str) -> str:
+    """Content hash of everything that determines a page's rendered HTML."""
+    data = b"\0".join(
+        (_RENDERER_DIGEST, markdown.encode("utf-8"), *template, basepath.encode("utf-8"))
+    )
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _rewrite_basepath(html: str, basepath: str) -> str:
+    """Prefix root-relative href/src URLs with basepath."""
+    if basepath == "/":
+        return html
+    return html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+
+
+def _load_template(template_path: str, basepath: str) -> tuple[bytes, ...]:
+    """Read a page template once, rewrite its URLs for basepath, and split it
+    into UTF-8 encoded fragments: literal text at even indices and the
+    {{ Title }} / {{ Content }} placeholder at each odd index."""
+    template = _rewrite_basepath(_read_text(template_path), basepath)
+    fragments = tuple(fragment.encode("utf-8") for fragment in _PLACEHOLDER_RE.split(template))
+    placeholders = set(fragments[1::2])
+    if len(placeholders) < 2:
+        raise ValueError(f"Template {template_path} must contain {{{{ Title }}}} and {{{{ Content }}}}")
+    return fragments
+
+
+def _basepath_marker(basepath: str) -> bytes:
+    """First line of every generated page, recording the basepath it was built for."""
+    return f"<!-- basepath: {basepath} -->\n".encode("utf-8")
+
+
+def _is_up_to_date(from_path: str, template_path: str, dest_path: str, basepath: str) -> bool:
+    """Whether dest_path is newer than its markdown and template and was built for basepath."""
+    try:
+        dest_mtime = os.stat(dest_path).st_mtime_ns
+        if dest_mtime < max(os.stat(from_path).st_mtime_ns, os.stat(template_path).st_mtime_ns):
+            return False
+        marker = _basepath_marker(basepath)
+        with open(dest_path, "rb") as f:
+            return f.read(len(marker)) == marker
+    except FileNotFoundError:
+        return False
+
+
+def _cached_page_path(
+    markdown: str, template: tuple[bytes, ...], basepath: str, cache_dir: str | None
+) -> str | None:
+    """Path of the page's entry in cache_dir (which may not exist yet), or None without a cache."""
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, f"{_cache_key(markdown, template, basepath)}.html")
+
+
+@lru_cache(maxsize=1024)
+def _markdown_to_html(markdown: str) -> str:
+    """Render markdown to an HTML string, memoized on the full markdown text."""
+    return markdown_to_html(markdown)
+
+
+def _render_page(markdown: str, template: tuple[bytes, ...], basepath: str) -> bytes:
+    """Render markdown into the split template, returning the encoded page."""
+    html_content = _rewrite_basepath(_markdown_to_html(markdown), basepath)
+    title = extract_title(markdown)
+    # One sized join; page text is never rescanned for placeholders and the
+    # template bytes are encoded once per build, not once per page.
+    title_bytes = title.encode("utf-8")
+    content_bytes = html_content.encode("utf-8")
+    parts = [_basepath_marker(basepath), *template]
+    parts[2::2] = [title_bytes if slot == _TITLE else content_bytes for slot in template[1::2]]
+    return b"".join(parts)
+
+
+def _store_page(dest_path: str, data: bytes, cached_path: str | None) -> None:
+    """Write a rendered page to dest_path and, if given, atomically to its cache entry."""
+    _write_bytes(dest_path, data)
+    if cached_path:
+        cache_dir = os.path.dirname(cached_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        # A unique temp file per call: two threads or processes may store
+        # the same entry at once.
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cached_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
 
 def generate_page(
-    from_path: str, template_path: str, dest_path: str, basepath: str = "/"
+    from_path: str,
+    template_path: str,
+    dest_path: str,
+    basepath: str = "/",
+    cache_dir: str | None = None,
+    template: tuple[bytes, ...] | None = None,
+    incremental: bool = False,
 ) -> None:
-    """Generate an HTML page from markdown using a template. Writes to dest_path."""
+    """Generate an HTML page from markdown using a template. Writes to dest_path.
+
+    If cache_dir is given, rendered pages are cached there keyed by a hash of
+    the markdown, template, basepath and renderer source. template
+    is the split from _load_template and is read from template_path if omitted.
+    With incremental=True nothing is done if dest_path is already up to date.
+    """
+    if incremental and _is_up_to_date(from_path, template_path, dest_path, basepath):
+        return
     print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    with open(from_path, encoding="utf-8") as f:
-        markdown = f.read()
-    with open(template_path, encoding="utf-8") as f:
-        template = f.read()
-    html_content = markdown_to_html_node(markdown).to_html()
-    title = extract_title(markdown)
-    html = template.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
-    html = html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+    markdown = _read_text(from_path)
+    if template is None:
+        template = _load_template(template_path, basepath)
     dest_dir = os.path.dirname(dest_path)
     if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(html)
+    cached_path = _cached_page_path(markdown, template, basepath, cache_dir)
+    if cached_path and os.path.isfile(cached_path):
+        shutil.copyfile(cached_path, dest_path)
+        return
+    _store_page(dest_path, _render_page(markdown, template, basepath), cached_path)
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    """Hardlink src to dest, replacing any existing file and falling back to a
+    copy (e.g. across filesystems)."""
+    if os.path.lexists(dest):
+        os.unlink(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
 
+def _copy_over(src: str, dest: str) -> None:
+    """Copy src to dest, first replacing a dest that is a hardlink to src
+    (left by an earlier link=True copy without a clean)."""
+    try:
+        shutil.copyfile(src, dest)
+    except shutil.SameFileError:
+        os.unlink(dest)
+        shutil.copyfile(src, dest)
 
-def copy_dir_contents(src: str, dest: str) -> None:
-    """Recursively copy all contents of src into dest. Cleans dest first."""
+
+def copy_dir_contents(
+    src: str, dest: str, link: bool = False, verbose: bool = False, clean: bool = True
+) -> None:
+    """Recursively copy all contents of src into dest. Cleans dest first unless clean=False.
+
+    With link=True files are hardlinked instead of copied, which is near
+    instant for local builds; verbose=True prints each file as it is copied.
+    """
     if not os.path.exists(src):
         return
-    if os.path.exists(dest):
+    if clean and os.path.exists(dest):
         shutil.rmtree(dest)
-    os.mkdir(dest)
-    for name in os.listdir(src):
-        src_path = os.path.join(src, name)
-        dest_path = os.path.join(dest, name)
-        if os.path.isfile(src_path):
-            shutil.copy(src_path, dest_path)
+    copy = _link_or_copy if link else _copy_over
+    if verbose:
+        def copy_function(src_path: str, dest_path: str) -> None:
+            copy(src_path, dest_path)
             print(f"Copied {src_path} -> {dest_path}")
-        else:
-            os.mkdir(dest_path)
-            copy_dir_contents(src_path, dest_path)
+    else:
+        copy_function = copy
+    shutil.copytree(src, dest, copy_function=copy_function, dirs_exist_ok=not clean)
+
+
+def _iter_markdown(dir_path: str, rel_dir: str = "") -> Iterator[tuple[str, str]]:
+    """Yield (path, path relative to the crawl root) for each .md file under dir_path."""
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_markdown(entry.path, os.path.join(rel_dir, entry.name))
+            elif entry.name.endswith(".md"):
+                yield entry.path, os.path.join(rel_dir, entry.name)
+
+
+def _render_one(job: tuple) -> None:
+    """Worker entry point for generate_pages_recursive; job holds generate_page's arguments."""
+    generate_page(*job)
+
+
+def _generate_pages_pipelined(jobs: list[tuple], depth: int) -> None:
+    """Render jobs in this process while a thread pool reads upcoming sources
+    (at most depth ahead) and writes finished pages, overlapping I/O with parsing."""
+    with ThreadPoolExecutor(max_workers=2) as io_pool:
+        pending = iter(jobs)
+        reads = deque((job, io_pool.submit(_read_text, job[0])) for job in islice(pending, depth))
+        writes = []
+        while reads:
+            job, markdown_future = reads.popleft()
+            upcoming = next(pending, None)
+            if upcoming is not None:
+                reads.append((upcoming, io_pool.submit(_read_text, upcoming[0])))
+            from_path, template_path, dest_path, basepath, cache_dir, template = job
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            markdown = markdown_future.result()
+            cached_path = _cached_page_path(markdown, template, basepath, cache_dir)
+            if cached_path and os.path.isfile(cached_path):
+                writes.append(io_pool.submit(shutil.copyfile, cached_path, dest_path))
+                continue
+            data = _render_page(markdown, template, basepath)
+            writes.append(io_pool.submit(_store_page, dest_path, data, cached_path))
+        for write in writes:
+            write.result()
 
 
 def generate_pages_recursive(
@@ -48,23 +263,60 @@ def generate_pages_recursive(
     template_path: str,
     dest_dir_path: str,
     basepath: str = "/",
+    cache_dir: str | None = None,
+    workers: int | None = None,
+    incremental: bool = False,
 ) -> None:
-    """Crawl content dir for .md files and generate HTML into dest dir using the template (same structure)."""
-    for dirpath, _dirnames, filenames in os.walk(dir_path_content):
-        for name in filenames:
-            if not name.endswith(".md"):
+    """Crawl content dir for .md files and generate HTML into dest dir using the template (same structure).
+
+    Pages are rendered in a pool of `workers` processes (default: one per CPU);
+    workers=1 renders in this process, with reads and writes pipelined on threads.
+    With incremental=True, pages newer than their markdown and the template
+    that were built for the same basepath are skipped. cache_dir is passed on
+    to generate_page and is off by default.
+    """
+    template = _load_template(template_path, basepath)
+    jobs = []
+    if os.path.isdir(dir_path_content):
+        for from_path, rel in _iter_markdown(dir_path_content):
+            dest_path = os.path.join(dest_dir_path, rel[:-3] + ".html")
+            if incremental and _is_up_to_date(from_path, template_path, dest_path, basepath):
                 continue
-            from_path = os.path.join(dirpath, name)
-            rel = os.path.relpath(from_path, dir_path_content)
-            dest_rel = os.path.splitext(rel)[0] + ".html"
-            dest_path = os.path.join(dest_dir_path, dest_rel)
-            generate_page(from_path, template_path, dest_path, basepath)
+            jobs.append((from_path, template_path, dest_path, basepath, cache_dir, template))
+    for dest_dir in {os.path.dirname(job[2]) for job in jobs}:
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _generate_pages_pipelined(jobs, depth=os.cpu_count() or 1)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_render_one, jobs))
 
 
 def main():
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-    copy_dir_contents("static", "docs")
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+    parser = argparse.ArgumentParser(description="Build the site from content/ and static/ into docs/.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix the site is served under")
+    parser.add_argument("--clean-cache", action="store_true", help=f"discard {CACHE_DIR}/ before building")
+    parser.add_argument("--link", action="store_true", help="hardlink static files instead of copying them")
+    parser.add_argument("--verbose", action="store_true", help="list every static file copied")
+    parser.add_argument(
+        "--incremental", action="store_true", help="keep docs/ and only regenerate pages whose sources changed"
+    )
+    parser.add_argument("--parallel", type=int, metavar="N", help="render pages in N processes (default: one per CPU)")
+    args = parser.parse_args()
+    if args.clean_cache and os.path.exists(CACHE_DIR):
+        shutil.rmtree(CACHE_DIR)
+    copy_dir_contents("static", "docs", link=args.link, verbose=args.verbose, clean=not args.incremental)
+    generate_pages_recursive(
+        "content",
+        "template.html",
+        "docs",
+        args.basepath,
+        cache_dir=CACHE_DIR,
+        workers=args.parallel,
+        incremental=args.incremental,
+    )
 
 
 if __name__ == "__main__":
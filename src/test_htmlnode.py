@@ -29,6 +29,29 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(tag="img", props={"alt": "A picture"})
         self.assertEqual(node.props_to_html(), ' alt="A picture"')
 
+    def test_props_to_html_memoized(self):
+        node = HTMLNode(tag="a", props={"href": "https://www.google.com"})
+        self.assertIs(node.props_to_html(), node.props_to_html())
+
+    def test_props_copied_at_construction(self):
+        props = {"href": "/a"}
+        node = HTMLNode(tag="a", props=props)
+        props["href"] = "/b"
+        self.assertEqual(node.props, {"href": "/a"})
+        self.assertEqual(node.props_to_html(), ' href="/a"')
+
+    def test_invalidate_props(self):
+        node = ParentNode("a", [LeafNode(None, "x")], {"href": "/a"})
+        self.assertEqual(node.to_html(), '<a href="/a">x</a>')
+        node.props["href"] = "/b"
+        node._invalidate_props()
+        self.assertEqual(node.props_to_html(), ' href="/b"')
+        self.assertEqual(node.to_html(), '<a href="/b">x</a>')
+
+    def test_slots(self):
+        for node in (HTMLNode("p"), LeafNode("p", "x"), ParentNode("div", [])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
     def test_repr(self):
         node = HTMLNode("p", "Hello", None, {"class": "intro"})
         repr_str = repr(node)
@@ -64,6 +87,16 @@ class TestLeafNode(unittest.TestCase):
             '<span class="highlight">inline</span>',
         )
 
+    def test_leaf_void_tag(self):
+        node = LeafNode("img", "", {"src": "/a.png", "alt": "A"})
+        self.assertEqual(node.to_html(), '<img src="/a.png" alt="A">')
+
+    def test_leaf_invalidate_props(self):
+        node = LeafNode("a", "link", {"href": "/a"})
+        node.props["href"] = "/b"
+        node._invalidate_props()
+        self.assertEqual(node.to_html(), '<a href="/b">link</a>')
+
     def test_leaf_no_value_raises(self):
         with self.assertRaises(ValueError):
             LeafNode("p", None).to_html()
@@ -142,6 +175,49 @@ class TestParentNode(unittest.TestCase):
             "<div><p><span>deep</span></p></div>",
         )
 
+    def test_to_html_memoized(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "x")])])
+        first = node.to_html()
+        self.assertEqual(first, "<div><p><b>x</b></p></div>")
+        self.assertIs(node.to_html(), first)
+
+    def test_to_html_nested_node_shared_between_trees(self):
+        nav = ParentNode("nav", [LeafNode("a", "home", {"href": "/"})])
+        page = ParentNode("body", [ParentNode("header", [nav])])
+        self.assertEqual(page.to_html(), '<body><header><nav><a href="/">home</a></nav></header></body>')
+        self.assertEqual(
+            ParentNode("footer", [nav]).to_html(),
+            '<footer><nav><a href="/">home</a></nav></footer>',
+        )
+
+    def test_to_html_uses_subclass_override_when_nested(self):
+        class BracketLeaf(LeafNode):
+            def to_html(self):
+                return f"[{self.tag}]{self.value}[/{self.tag}]"
+
+        try:
+            leaf = BracketLeaf("b", "y")
+        except TypeError:
+            self.skipTest("mypyc-compiled classes cannot be subclassed from Python")
+        self.assertEqual(ParentNode("p", [leaf]).to_html(), "<p>[b]y[/b]</p>")
+
+    def test_to_html_deep_nesting(self):
+        node = LeafNode(None, "x")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        self.assertEqual(node.to_html(), "<span>" * 5000 + "x" + "</span>" * 5000)
+
+    def test_to_html_nested_no_children_raises(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode("p", None)]).to_html()
+
+    def test_children_frozen_to_tuple(self):
+        children = [LeafNode("b", "x")]
+        node = ParentNode("p", children)
+        children.append(LeafNode(None, "y"))
+        self.assertEqual(node.children, (children[0],))
+        self.assertEqual(node.to_html(), "<p><b>x</b></p>")
+
     def test_to_html_no_tag_raises(self):
         with self.assertRaises(ValueError) as ctx:
             ParentNode(None, [LeafNode("span", "x")]).to_html()
@@ -0,0 +1,237 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import main
+from main import copy_dir_contents, generate_page, generate_pages_recursive
+
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class TestGeneratePage(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.md_path = self._write("index.md", "# Hello\n\nSome **bold** text")
+        self.template_path = self._write("template.html", TEMPLATE)
+        self.cache_dir = os.path.join(self.tmp, "cache")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name: str, text: str) -> str:
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def _read(self, path: str) -> str:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _generate(self, dest_path: str, basepath: str = "/", cache_dir=None) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.md_path, self.template_path, dest_path, basepath, cache_dir)
+
+    def test_generate_page(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, "/site/")
+        self.assertEqual(
+            self._read(dest),
+            "<!-- basepath: /site/ -->\n"
+            '<title>Hello</title><link href="/site/index.css">'
+            "<article><div><h1>Hello</h1><p>Some <b>bold</b> text</p></div></article>",
+        )
+
+    def test_generate_page_leaves_placeholders_in_page_text(self):
+        self.md_path = self._write("index.md", "# {{ Content }}\n\nLiteral `{{ Title }}`")
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest)
+        self.assertEqual(
+            self._read(dest),
+            "<!-- basepath: / -->\n"
+            '<title>{{ Content }}</title><link href="/index.css">'
+            "<article><div><h1>{{ Content }}</h1><p>Literal <code>{{ Title }}</code></p></div></article>",
+        )
+
+    def test_generate_page_fills_repeated_placeholder(self):
+        self._write("template.html", "<title>{{ Title }}</title><h1>{{ Title }}</h1>{{ Content }}")
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest)
+        self.assertEqual(
+            self._read(dest),
+            "<!-- basepath: / -->\n"
+            "<title>Hello</title><h1>Hello</h1><div><h1>Hello</h1><p>Some <b>bold</b> text</p></div>",
+        )
+
+    def test_generate_page_content_before_title(self):
+        self._write("template.html", "<main>{{ Content }}</main><footer>{{ Title }}</footer>")
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest)
+        self.assertEqual(
+            self._read(dest),
+            "<!-- basepath: / -->\n"
+            "<main><div><h1>Hello</h1><p>Some <b>bold</b> text</p></div></main><footer>Hello</footer>",
+        )
+
+    def test_generate_page_normalizes_crlf(self):
+        self.md_path = self._write("crlf.md", "")
+        with open(self.md_path, "wb") as f:
+            f.write(b"# Hello\r\n\r\nSome text")
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest)
+        self.assertIn("<h1>Hello</h1><p>Some text</p>", self._read(dest))
+
+    def _generate_incremental(self, dest_path: str, basepath: str) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.md_path, self.template_path, dest_path, basepath, None, incremental=True)
+
+    def test_generate_page_incremental_skips_up_to_date(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, "/site/")
+        edited = self._read(dest).replace("Some", "Edited")
+        self._write(os.path.join("out", "index.html"), edited)
+        self._generate_incremental(dest, "/site/")
+        self.assertEqual(self._read(dest), edited)
+
+    def test_generate_page_incremental_rebuilds_changed(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, "/site/")
+        self._generate_incremental(dest, "/other/")
+        self.assertIn('href="/other/index.css"', self._read(dest))
+
+        self._write(os.path.join("out", "index.html"), "<!-- basepath: /other/ -->\nstale")
+        mtime = os.stat(dest).st_mtime_ns
+        os.utime(self.md_path, ns=(mtime, mtime + 10**9))
+        self._generate_incremental(dest, "/other/")
+        self.assertIn("Some <b>bold</b>", self._read(dest))
+
+    def test_generate_page_template_missing_placeholder_raises(self):
+        self._write("template.html", "<article>{{ Content }}</article>")
+        with self.assertRaises(ValueError) as ctx:
+            self._generate(os.path.join(self.tmp, "out", "index.html"))
+        self.assertIn("Title", str(ctx.exception))
+
+    def test_generate_page_populates_cache(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, cache_dir=self.cache_dir)
+        entries = os.listdir(self.cache_dir)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(
+            self._read(os.path.join(self.cache_dir, entries[0])), self._read(dest)
+        )
+
+    def test_generate_page_served_from_cache(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, cache_dir=self.cache_dir)
+        (entry,) = os.listdir(self.cache_dir)
+        self._write(os.path.join("cache", entry), "cached")
+        self._generate(dest, cache_dir=self.cache_dir)
+        self.assertEqual(self._read(dest), "cached")
+
+    def test_generate_page_cache_keyed_on_basepath(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, "/", cache_dir=self.cache_dir)
+        self._generate(dest, "/site/", cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertIn('href="/site/index.css"', self._read(dest))
+
+    def test_generate_page_cache_keyed_on_renderer(self):
+        dest = os.path.join(self.tmp, "out", "index.html")
+        self._generate(dest, cache_dir=self.cache_dir)
+        with mock.patch.object(main, "_RENDERER_DIGEST", b"older renderer"):
+            self._generate(dest, cache_dir=self.cache_dir)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_generate_page_no_cache_by_default(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page("index.md", "template.html", os.path.join("out", "index.html"))
+            self.assertFalse(os.path.exists(main.CACHE_DIR))
+        finally:
+            os.chdir(cwd)
+
+
+class TestGeneratePagesRecursive(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = self._tmp.name
+        self.content = os.path.join(self.tmp, "content")
+        self.dest = os.path.join(self.tmp, "docs")
+        for rel in ("index.md", os.path.join("blog", "a", "index.md"), os.path.join("blog", "b", "index.md")):
+            path = os.path.join(self.content, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# {rel}")
+        self.template_path = os.path.join(self.tmp, "template.html")
+        with open(self.template_path, "w", encoding="utf-8") as f:
+            f.write(TEMPLATE)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _generated(self) -> list[str]:
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, name), self.dest)
+            for dirpath, _dirnames, filenames in os.walk(self.dest)
+            for name in filenames
+        )
+
+    def test_mirrors_content_tree(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_pages_recursive(
+                        self.content, self.template_path, self.dest, cache_dir=None, workers=workers
+                    )
+                self.assertEqual(
+                    self._generated(),
+                    [os.path.join("blog", "a", "index.html"), os.path.join("blog", "b", "index.html"), "index.html"],
+                )
+
+
+class TestCopyDirContents(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self._tmp.name, "static")
+        self.dest = os.path.join(self._tmp.name, "docs")
+        os.makedirs(os.path.join(self.src, "images"))
+        for rel in ("index.css", os.path.join("images", "a.png")):
+            with open(os.path.join(self.src, rel), "w") as f:
+                f.write(rel)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_copies_tree_and_cleans_dest(self):
+        os.makedirs(self.dest)
+        with open(os.path.join(self.dest, "stale.html"), "w") as f:
+            f.write("stale")
+        for link in (False, True):
+            with self.subTest(link=link):
+                copy_dir_contents(self.src, self.dest, link=link)
+                self.assertEqual(sorted(os.listdir(self.dest)), ["images", "index.css"])
+                with open(os.path.join(self.dest, "images", "a.png")) as f:
+                    self.assertEqual(f.read(), os.path.join("images", "a.png"))
+                self.assertEqual(
+                    os.path.samefile(os.path.join(self.src, "index.css"), os.path.join(self.dest, "index.css")),
+                    link,
+                )
+
+    def test_copy_without_clean_replaces_hardlinks(self):
+        copy_dir_contents(self.src, self.dest, link=True)
+        copy_dir_contents(self.src, self.dest, clean=False)
+        dest_css = os.path.join(self.dest, "index.css")
+        self.assertFalse(os.path.samefile(os.path.join(self.src, "index.css"), dest_css))
+        with open(dest_css) as f:
+            self.assertEqual(f.read(), "index.css")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from dataclasses import FrozenInstanceError
 from enum import Enum
 
 from htmlnode import LeafNode, ParentNode
@@ -14,9 +15,11 @@ from textnode import (
     split_nodes_image,
     split_nodes_link,
     text_to_textnodes,
+    text_to_children,
     markdown_to_blocks,
     block_to_block_type,
     markdown_to_html_node,
+    markdown_to_html,
     extract_title,
 )
 
@@ -57,6 +60,12 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("Link", TextType.LINK, "https://example.com")
         self.assertNotEqual(node, node2)
 
+    def test_frozen_and_hashable(self):
+        node = TextNode("Link", TextType.LINK, "https://example.com")
+        with self.assertRaises(FrozenInstanceError):
+            node.text = "Other"
+        self.assertEqual(hash(node), hash(TextNode("Link", TextType.LINK, "https://example.com")))
+
 
 class TestTextNodeToHTMLNode(unittest.TestCase):
     def test_text(self):
@@ -532,6 +541,37 @@ class TestTextToTextnodes(unittest.TestCase):
             ],
         )
 
+    def test_text_to_textnodes_image_wins_over_overlapping_link(self):
+        self.assertListEqual(
+            text_to_textnodes("[a](![x)](y)"),
+            [
+                TextNode("[a](", TextType.TEXT),
+                TextNode("x)", TextType.IMAGE, "y"),
+            ],
+        )
+
+    def test_text_to_textnodes_delimiter_inside_code(self):
+        nodes = text_to_textnodes("Use `snake_case` names")
+        self.assertListEqual(
+            nodes,
+            [
+                TextNode("Use ", TextType.TEXT),
+                TextNode("snake_case", TextType.CODE),
+                TextNode(" names", TextType.TEXT),
+            ],
+        )
+
+    def test_text_to_textnodes_memoized_returns_fresh_list(self):
+        first = text_to_textnodes("Some **bold** here")
+        first.append(TextNode("extra", TextType.TEXT))
+        second = text_to_textnodes("Some **bold** here")
+        self.assertEqual(len(second), 3)
+        self.assertIs(first[1], second[1])
+
+    def test_text_to_textnodes_unclosed_raises(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("a **bold [link](https://x.com) b**")
+
 
 class TestMarkdownToBlocks(unittest.TestCase):
     def test_markdown_to_blocks(self):
@@ -737,6 +777,36 @@ the **same** even with inline stuff
             "<div><blockquote>Quote line one Quote <b>two</b></blockquote></div>",
         )
 
+    def test_edited_leaf_does_not_leak_into_later_renders(self):
+        node = markdown_to_html_node("See [docs](/x)")
+        leaf = node.children[0].children[1]
+        leaf.props["href"] = "/y"
+        leaf._invalidate_props()
+        expected = '<div><p>See <a href="/x">docs</a></p></div>'
+        self.assertEqual(markdown_to_html_node("See [docs](/x)").to_html(), expected)
+        self.assertEqual(markdown_to_html("See [docs](/x)"), expected)
+        self.assertEqual(text_to_children("See [docs](/x)")[1].props, {"href": "/x"})
+
+    def test_markdown_to_html_matches_node_tree(self):
+        md = """# Title _here_
+
+Para with **bold**
+and a [link](/x)
+
+> quoted
+>> nested
+
+- one
+- `two`
+
+1. first
+2. ![img](/i.png)
+
+```
+code _raw_
+```"""
+        self.assertEqual(markdown_to_html(md), markdown_to_html_node(md).to_html())
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
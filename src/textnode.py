@@ -1,8 +1,14 @@
 import re
+from dataclasses import dataclass
+from collections.abc import Callable, Iterator
 from enum import Enum
+from functools import lru_cache
 
 from htmlnode import LeafNode, ParentNode
 
+_IMG_RE = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_LINK_RE = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 
 class TextType(Enum):
     TEXT = "text"
@@ -13,39 +19,46 @@ class TextType(Enum):
     IMAGE = "image"
 
 
+@dataclass(frozen=True, slots=True, repr=False)
 class TextNode:
-    def __init__(self, text: str, text_type: TextType, url: str | None = None):
-        self.text = text
-        self.text_type = text_type
-        self.url = url
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, TextNode):
-            return False
-        return (
-            self.text == other.text
-            and self.text_type == other.text_type
-            and self.url == other.url
-        )
+    # Frozen: text_to_textnodes hands out shared, cached instances. text_type
+    # is annotated as any Enum so compiled builds (compile.sh mypyc) still let
+    # text_node_to_html_node reject foreign enum members with a ValueError.
+    text: str
+    text_type: Enum
+    url: str | None = None
 
     def __repr__(self) -> str:
-        return f"TextNode({self.text!r}, {self.text_type.value!r}, {self.url!r})"
+        value = _TEXT_TYPE_VALUES.get(self.text_type)
+        if value is None:
+            value = self.text_type.value
+        return f"TextNode({self.text!r}, {value!r}, {self.url!r})"
+
+
+# Enum .value goes through a descriptor on every access; look it up once.
+_TEXT_TYPE_VALUES: dict[Enum, str] = {text_type: text_type.value for text_type in TextType}
+
+
+# Tag names and attribute keys are identifier-like literals, which CPython
+# already interns as code constants; no sys.intern() pass is needed.
+_TEXT_NODE_CONVERTERS: dict[Enum, Callable[[TextNode], LeafNode]] = {
+    TextType.TEXT: lambda n: LeafNode(None, n.text),
+    TextType.BOLD: lambda n: LeafNode("b", n.text),
+    TextType.ITALIC: lambda n: LeafNode("i", n.text),
+    TextType.CODE: lambda n: LeafNode("code", n.text),
+    TextType.LINK: lambda n: LeafNode("a", n.text, {"href": n.url or ""}),
+    TextType.IMAGE: lambda n: LeafNode("img", "", {"src": n.url or "", "alt": n.text}),
+}
 
 
 def text_node_to_html_node(text_node: TextNode) -> LeafNode:
-    if text_node.text_type == TextType.TEXT:
-        return LeafNode(None, text_node.text)
-    if text_node.text_type == TextType.BOLD:
-        return LeafNode("b", text_node.text)
-    if text_node.text_type == TextType.ITALIC:
-        return LeafNode("i", text_node.text)
-    if text_node.text_type == TextType.CODE:
-        return LeafNode("code", text_node.text)
-    if text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url or ""})
-    if text_node.text_type == TextType.IMAGE:
-        return LeafNode("img", "", {"src": text_node.url or "", "alt": text_node.text})
-    raise ValueError(f"Unknown text type: {text_node.text_type}")
+    converter = _TEXT_NODE_CONVERTERS.get(text_node.text_type)
+    if converter is None:
+        raise ValueError(f"Unknown text type: {text_node.text_type}")
+    return converter(text_node)
+
+
+_DELIMITER_TYPES = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
 
 
 def split_nodes_delimiter(
@@ -53,53 +66,44 @@ def split_nodes_delimiter(
 ) -> list[TextNode]:
     new_nodes: list[TextNode] = []
     for node in old_nodes:
-        if node.text_type != TextType.TEXT:
+        if node.text_type is not TextType.TEXT or delimiter not in node.text:
             new_nodes.append(node)
             continue
         parts = node.text.split(delimiter)
-        if len(parts) == 1:
-            new_nodes.append(node)
-            continue
         if len(parts) % 2 == 0:
             raise ValueError(
                 f"Invalid markdown: unclosed delimiter {delimiter!r}"
             )
-        for i, part in enumerate(parts):
-            if i % 2 == 0:
-                new_nodes.append(TextNode(part, TextType.TEXT))
-            else:
-                new_nodes.append(TextNode(part, text_type))
+        new_nodes.extend(
+            [TextNode(part, text_type if i % 2 else TextType.TEXT) for i, part in enumerate(parts)]
+        )
     return new_nodes
 
 
 def extract_markdown_images(text: str) -> list[tuple[str, str]]:
     """Return list of (alt_text, url) for markdown images ![alt](url)."""
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _IMG_RE.findall(text)
 
 
 def extract_markdown_links(text: str) -> list[tuple[str, str]]:
     """Return list of (anchor_text, url) for markdown links [text](url). Excludes images."""
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return _LINK_RE.findall(text)
 
 
-def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
-    """Split TEXT nodes by markdown images ![alt](url); non-TEXT nodes pass through."""
+def _split_nodes_by(old_nodes: list[TextNode], pattern: re.Pattern, text_type: TextType) -> list[TextNode]:
+    """Split TEXT nodes on pattern matches, turning each (text, url) match into a text_type node."""
     new_nodes: list[TextNode] = []
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
     for node in old_nodes:
-        if node.text_type != TextType.TEXT:
+        # Both patterns need a "](" between anchor and url; most text has none.
+        if node.text_type is not TextType.TEXT or "](" not in node.text:
             new_nodes.append(node)
             continue
         text = node.text
         last_end = 0
-        for m in re.finditer(pattern, text):
-            before = text[last_end : m.start()]
-            if before:
-                new_nodes.append(TextNode(before, TextType.TEXT))
-            alt, url = m.groups()
-            new_nodes.append(TextNode(alt, TextType.IMAGE, url))
+        for m in pattern.finditer(text):
+            if m.start() > last_end:
+                new_nodes.append(TextNode(text[last_end : m.start()], TextType.TEXT))
+            new_nodes.append(TextNode(m.group(1), text_type, m.group(2)))
             last_end = m.end()
         if last_end < len(text):
             new_nodes.append(TextNode(text[last_end:], TextType.TEXT))
@@ -108,53 +112,152 @@ def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
     return new_nodes
 
 
+def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
+    """Split TEXT nodes by markdown images ![alt](url); non-TEXT nodes pass through."""
+    return _split_nodes_by(old_nodes, _IMG_RE, TextType.IMAGE)
+
+
 def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
     """Split TEXT nodes by markdown links [anchor](url); non-TEXT nodes pass through."""
-    new_nodes: list[TextNode] = []
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    for node in old_nodes:
-        if node.text_type != TextType.TEXT:
-            new_nodes.append(node)
-            continue
-        text = node.text
-        last_end = 0
-        for m in re.finditer(pattern, text):
-            before = text[last_end : m.start()]
-            if before:
-                new_nodes.append(TextNode(before, TextType.TEXT))
-            anchor, url = m.groups()
-            new_nodes.append(TextNode(anchor, TextType.LINK, url))
-            last_end = m.end()
-        if last_end < len(text):
-            new_nodes.append(TextNode(text[last_end:], TextType.TEXT))
-        elif last_end == 0:
-            new_nodes.append(node)
-    return new_nodes
+    return _split_nodes_by(old_nodes, _LINK_RE, TextType.LINK)
+
+
+def _split_delimited(text: str, start: int, end: int, nodes: list[TextNode]) -> None:
+    """Append TextNodes for text[start:end], splitting out **bold**, _italic_ and `code` spans."""
+    # Next position of each delimiter at or after pos; only the ones that
+    # fall behind pos are searched for again.
+    next_bold = text.find("**", start, end)
+    next_italic = text.find("_", start, end)
+    next_code = text.find("`", start, end)
+    if next_bold < 0 and next_italic < 0 and next_code < 0:
+        nodes.append(TextNode(text[start:end], TextType.TEXT))
+        return
+    pos = start
+    while True:
+        if next_bold != -1 and next_bold < pos:
+            next_bold = text.find("**", pos, end)
+        if next_italic != -1 and next_italic < pos:
+            next_italic = text.find("_", pos, end)
+        if next_code != -1 and next_code < pos:
+            next_code = text.find("`", pos, end)
+        opener, found = end, ""
+        if 0 <= next_bold < opener:
+            opener, found = next_bold, "**"
+        if 0 <= next_italic < opener:
+            opener, found = next_italic, "_"
+        if 0 <= next_code < opener:
+            opener, found = next_code, "`"
+        if not found:
+            break
+        content_start = opener + len(found)
+        close = text.find(found, content_start, end)
+        if close < 0:
+            raise ValueError(f"Invalid markdown: unclosed delimiter {found!r}")
+        nodes.append(TextNode(text[pos:opener], TextType.TEXT))
+        nodes.append(TextNode(text[content_start:close], _DELIMITER_TYPES[found]))
+        pos = close + len(found)
+    nodes.append(TextNode(text[pos:end], TextType.TEXT))
 
 
 def text_to_textnodes(text: str) -> list[TextNode]:
-    """Convert raw markdown text to a list of TextNodes (images, links, bold, italic, code)."""
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    return nodes
+    """Convert raw markdown text to a list of TextNodes (images, links, bold, italic, code).
+
+    Results are memoized by text; the list is fresh but the nodes are shared.
+    """
+    return list(_text_to_textnodes(text))
+
+
+def _iter_refs(text: str, start: int, end: int, text_type: TextType) -> Iterator[tuple[int, int, TextNode]]:
+    """Yield (start, end, node) for each image (or link) in text[start:end], left to right.
+
+    Matches exactly what _IMG_RE (or _LINK_RE) finds in that slice, but works
+    outward from each "](" with str.find instead of trying a regex at every
+    position: the anchor must hold no brackets and the url no parentheses.
+    """
+    image = text_type is TextType.IMAGE
+    # Every cursor only moves forward, so the scan stays linear even on
+    # adversarial runs of brackets: the anchor's "[" is searched for only
+    # after the previous "]" (or match end), and the next ")" and "(" are
+    # remembered until the url start passes them.
+    floor = start
+    close = paren = -1
+    mid = text.find("](", start, end)
+    while mid >= 0:
+        url_start = mid + 2
+        if close < url_start:
+            close = text.find(")", url_start, end)
+            if close < 0:
+                return
+        if paren < url_start:
+            paren = text.find("(", url_start, end)
+            if paren < 0:
+                paren = end
+        bracket = text.rfind("[", floor, mid)
+        if bracket >= 0 and paren > close and text.find("]", bracket, mid) < 0:
+            # A "!" before the "[" makes an image; at the slice start there is
+            # nothing before it, as for a regex run on the slice.
+            bang = bracket > start and text[bracket - 1] == "!"
+            if bang is image:
+                node = TextNode(text[bracket + 1 : mid], text_type, text[url_start:close])
+                yield (bracket - 1 if image else bracket), close + 1, node
+                floor = close + 1
+                mid = text.find("](", floor, end)
+                continue
+        floor = mid + 1
+        mid = text.find("](", floor, end)
+
+
+def _split_refs(text: str, start: int, end: int, text_type: TextType, nodes: list[TextNode]) -> None:
+    """Append TextNodes for text[start:end]: images first, then links in the text
+    between them, then delimited spans, as chaining the split_nodes_* functions does."""
+    last_end = start
+    for ref_start, ref_end, node in _iter_refs(text, start, end, text_type):
+        if ref_start > last_end:
+            _split_rest(text, last_end, ref_start, text_type, nodes)
+        nodes.append(node)
+        last_end = ref_end
+    if last_end < end or last_end == start:
+        _split_rest(text, last_end, end, text_type, nodes)
+
+
+def _split_rest(text: str, start: int, end: int, text_type: TextType, nodes: list[TextNode]) -> None:
+    """Split the text between two text_type refs with the next, lower-precedence pass."""
+    if text_type is TextType.IMAGE:
+        _split_refs(text, start, end, TextType.LINK, nodes)
+    else:
+        _split_delimited(text, start, end, nodes)
+
+
+@lru_cache(maxsize=4096)
+def _text_to_textnodes(text: str) -> tuple[TextNode, ...]:
+    """Tokenize inline markdown; the cached worker behind text_to_textnodes.
+
+    Images are found first, then links in the text between them; what is left
+    is scanned left to right for delimited spans. Well-formed input gives the
+    same nodes as chaining the split_nodes_* functions, without the
+    intermediate lists.
+    """
+    nodes: list[TextNode] = []
+    _split_refs(text, 0, len(text), TextType.IMAGE, nodes)
+    return tuple(nodes)
 
 
 def markdown_to_blocks(markdown: str) -> list[str]:
     """Split raw markdown document into block strings (by double newline). Strips and drops empty blocks."""
-    blocks = markdown.split("\n\n")
-    return [b.strip() for b in blocks if b.strip()]
+    return [block for part in markdown.split("\n\n") if (block := part.strip())]
 
 
 def extract_title(markdown: str) -> str:
     """Extract the h1 header (line starting with a single #) from markdown. Raises if not found."""
-    for line in markdown.split("\n"):
-        if line.startswith("# "):
-            return line[2:].strip()
-    raise ValueError("No h1 header found in markdown")
+    if markdown.startswith("# "):
+        start = 2
+    else:
+        start = markdown.find("\n# ")
+        if start < 0:
+            raise ValueError("No h1 header found in markdown")
+        start += 3
+    end = markdown.find("\n", start)
+    return markdown[start : end if end >= 0 else len(markdown)].strip()
 
 
 class BlockType(Enum):
@@ -166,70 +269,101 @@ class BlockType(Enum):
     PARAGRAPH = "paragraph"
 
 
+# One anchored match classifies a block. Code fences, quotes and bullet lists
+# are validated in full by the regex itself (every line of a quote starts
+# with ">", every bullet with "- "); ordered lists are only nominated here
+# because their numbering has to be checked line by line.
+_BLOCK_TYPE_RE = re.compile(
+    r"(?P<heading>#{1,6} )"
+    r"|(?P<code>```\n[\s\S]*```\Z)"
+    r"|(?P<quote>>[^\n]*(?:\n>[^\n]*)*\Z)"
+    r"|(?P<unordered>- [^\n]*(?:\n- [^\n]*)*\Z)"
+    r"|(?P<ordered>1\. )"
+)
+
+
+_NO_LINES: list[str] = []
+
+
+def _heading_level(block: str) -> int:
+    """Return the heading level (1-6) of a block opening with #'s and a space, else 0."""
+    level = 0
+    length = len(block)
+    while level < 6 and level < length and block[level] == "#":
+        level += 1
+    return level if 0 < level < length and block[level] == " " else 0
+
+
 def block_to_block_type(block: str) -> BlockType:
     """Return the BlockType for a single markdown block (assumes block is already stripped)."""
-    if not block:
-        return BlockType.PARAGRAPH
-    lines = block.split("\n")
+    return _classify_block(block)[0]
 
-    if re.match(r"^#{1,6} ", block):
-        return BlockType.HEADING
 
-    if block.startswith("```\n") and block.endswith("```"):
-        return BlockType.CODE
+def _classify_block(block: str) -> tuple[BlockType, list[str]]:
+    """Classify a block, also returning its lines for quote and list blocks (else empty)."""
+    m = _BLOCK_TYPE_RE.match(block)
+    if m is None:
+        return BlockType.PARAGRAPH, _NO_LINES
+    kind = m.lastgroup
 
-    if all(line.startswith(">") for line in lines):
-        return BlockType.QUOTE
+    if kind == "heading":
+        return BlockType.HEADING, _NO_LINES
+    if kind == "code":
+        return BlockType.CODE, _NO_LINES
 
-    if all(line.startswith("- ") for line in lines):
-        return BlockType.UNORDERED_LIST
-
-    if lines:
-        ordered = all(
-            lines[i].startswith(f"{i + 1}. ") for i in range(len(lines))
-        )
-        if ordered:
-            return BlockType.ORDERED_LIST
+    lines = block.split("\n")
+    if kind == "quote":
+        return BlockType.QUOTE, lines
+    if kind == "unordered":
+        return BlockType.UNORDERED_LIST, lines
+    if all(line.startswith(f"{i}. ") for i, line in enumerate(lines, 1)):
+        return BlockType.ORDERED_LIST, lines
 
-    return BlockType.PARAGRAPH
+    return BlockType.PARAGRAPH, lines
 
 
 def text_to_children(text: str) -> list[LeafNode]:
-    """Convert inline markdown text to a list of LeafNode children (no block-level parsing)."""
-    text_nodes = text_to_textnodes(text)
-    return [text_node_to_html_node(tn) for tn in text_nodes]
+    """Convert inline markdown text to a list of LeafNode children (no block-level parsing).
+
+    The leaves are built fresh on every call, so callers may edit them.
+    """
+    # Text with no image/link marker and no delimiter is a single plain leaf;
+    # skip the tokenizer and its TextNode.
+    if "](" not in text and "**" not in text and "_" not in text and "`" not in text:
+        return [LeafNode(None, text)]
+    return [text_node_to_html_node(tn) for tn in _text_to_textnodes(text)]
 
 
 def _block_to_html_node(block: str) -> ParentNode:
     """Convert a single markdown block to an HTML node (ParentNode or wrapper)."""
-    block_type = block_to_block_type(block)
-    lines = block.split("\n")
+    # Classification already split quote and list blocks into lines; reuse them.
+    block_type, lines = _classify_block(block)
 
-    if block_type == BlockType.PARAGRAPH:
+    if block_type is BlockType.CODE:
+        # Fenced code is emitted verbatim: no line split, no inline parsing.
+        return ParentNode("pre", [LeafNode("code", block[4:-3])])
+
+    if block_type is BlockType.PARAGRAPH:
         text = block.replace("\n", " ")
         return ParentNode("p", text_to_children(text))
 
-    if block_type == BlockType.HEADING:
-        m = re.match(r"^(#{1,6}) ", block)
-        level = len(m.group(1))
-        heading_text = block[m.end() :]
+    if block_type is BlockType.HEADING:
+        level = _heading_level(block)
+        heading_text = block[level + 1 :]
         return ParentNode(f"h{level}", text_to_children(heading_text))
 
-    if block_type == BlockType.CODE:
-        content = block[4:-3]
-        return ParentNode("pre", [LeafNode("code", content)])
-
-    if block_type == BlockType.QUOTE:
-        quote_text = " ".join(line.lstrip(">").strip() for line in lines)
+    if block_type is BlockType.QUOTE:
+        # lstrip(">") drops nested markers too, so ">> a" and ">a" both give "a".
+        quote_text = " ".join([line.lstrip(">").strip() for line in lines])
         return ParentNode("blockquote", text_to_children(quote_text))
 
-    if block_type == BlockType.UNORDERED_LIST:
+    if block_type is BlockType.UNORDERED_LIST:
         items = [ParentNode("li", text_to_children(line[2:])) for line in lines]
         return ParentNode("ul", items)
 
-    if block_type == BlockType.ORDERED_LIST:
+    if block_type is BlockType.ORDERED_LIST:
         items = [
-            ParentNode("li", text_to_children(line.split(". ", 1)[1]))
+            ParentNode("li", text_to_children(line[line.index(". ") + 2 :]))
             for line in lines
         ]
         return ParentNode("ol", items)
@@ -242,4 +376,58 @@ def markdown_to_html_node(markdown: str) -> ParentNode:
     """Convert a full markdown document to a single parent div of block nodes."""
     blocks = markdown_to_blocks(markdown)
     block_nodes = [_block_to_html_node(block) for block in blocks]
-    return ParentNode("div", block_nodes)
\ No newline at end of file
+    return ParentNode("div", block_nodes)
+
+
+@lru_cache(maxsize=4096)
+def _inline_html(text: str) -> str:
+    """Render inline markdown text straight to its HTML string.
+
+    Only the string is cached; the leaves it was rendered from are discarded.
+    """
+    return "".join([leaf.to_html() for leaf in text_to_children(text)])
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Render a full markdown document to an HTML string without building the node tree.
+
+    Gives the same output as markdown_to_html_node(markdown).to_html(); use the
+    node API when the tree itself is needed.
+    """
+    parts = ["<div>"]
+    append = parts.append
+    for block in markdown_to_blocks(markdown):
+        block_type, lines = _classify_block(block)
+        if block_type is BlockType.CODE:
+            append("<pre><code>")
+            append(block[4:-3])
+            append("</code></pre>")
+        elif block_type is BlockType.HEADING:
+            level = _heading_level(block)
+            append(f"<h{level}>")
+            append(_inline_html(block[level + 1 :]))
+            append(f"</h{level}>")
+        elif block_type is BlockType.QUOTE:
+            append("<blockquote>")
+            append(_inline_html(" ".join([line.lstrip(">").strip() for line in lines])))
+            append("</blockquote>")
+        elif block_type is BlockType.UNORDERED_LIST:
+            append("<ul>")
+            for line in lines:
+                append("<li>")
+                append(_inline_html(line[2:]))
+                append("</li>")
+            append("</ul>")
+        elif block_type is BlockType.ORDERED_LIST:
+            append("<ol>")
+            for line in lines:
+                append("<li>")
+                append(_inline_html(line[line.index(". ") + 2 :]))
+                append("</li>")
+            append("</ol>")
+        else:
+            append("<p>")
+            append(_inline_html(block.replace("\n", " ")))
+            append("</p>")
+    append("</div>")
+    return "".join(parts)
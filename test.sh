@@ -1 +1 @@
-python3 -m unittest discover -s src
\ No newline at end of file
+${PYTHON:-python3} -m unittest discover -s src
\ No newline at end of file